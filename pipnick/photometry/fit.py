@@ -4,10 +4,14 @@
 ###################################################################################
 
 import numpy as np
+import pandas as pd
 from matplotlib import pyplot as plt
 from matplotlib import ticker
 from matplotlib.backends.backend_pdf import PdfPages
 from pathlib import Path
+from functools import partial
+from multiprocessing import Pool
+import os
 import logging
 
 from astropy.io import fits
@@ -24,8 +28,74 @@ from pipnick.utils.nickel_data import plate_scale_approx
 
 logger = logging.getLogger(__name__)
 
+# Initial guesses for the Moffat fits; gamma is derived from the expected
+# seeing FWHM once at import
+_P0_DEFAULT_FWHM = 8
+_P0_ALPHA = 3.5
+_P0_GAMMA = _P0_DEFAULT_FWHM / 2 / np.sqrt(2**(1/_P0_ALPHA)-1)
 
-def fit_psf_stack(input_base, num_images, fittype='ellip', ofile=None):
+
+def _get_p0(fittype, stamp, stamp_width):
+    """
+    Construct the initial Moffat parameter guess for a stamp.
+
+    Args:
+        fittype (str): Type of model to fit ('ellip' or 'circ')
+        stamp (ndarray): 2D stamp image being fit.
+        stamp_width (int): Width of the stamps.
+
+    Returns:
+        ndarray: Initial parameter guesses in the fitter's par format.
+    """
+    if fittype == 'ellip':
+        return np.array([float(stamp_width//2), float(stamp_width//2),
+                         np.amax(stamp), _P0_GAMMA, _P0_GAMMA, 0.0,
+                         _P0_ALPHA, 0.0])
+    elif fittype == 'circ':
+        return np.array([float(stamp_width//2), float(stamp_width//2),
+                         np.amax(stamp), _P0_GAMMA, _P0_ALPHA, 0.0])
+
+
+def _load_srcdb(src_ofile):
+    """
+    Load the source database, caching the parsed array as a .npy file
+    alongside the text file so reruns skip the text parse entirely.
+
+    Args:
+        src_ofile (Path): Path to the source database file.
+
+    Returns:
+        ndarray: Source database as a float array.
+    """
+    npy_cache = src_ofile.with_suffix('.npy')
+    if npy_cache.exists() and npy_cache.stat().st_mtime >= src_ofile.stat().st_mtime:
+        return np.load(npy_cache, mmap_mode='r')
+    srcdb = pd.read_csv(src_ofile, sep=r'\s+', header=None, comment='#',
+                        dtype=np.float64).to_numpy()
+    np.save(npy_cache, srcdb)
+    return srcdb
+
+
+def load_psf_inputs(input_base):
+    """
+    Open the stamp FITS file and parse the source database for a stamp base
+    once, so repeated fit_psf_stack/fit_psf_single calls on the same base can
+    share them via the preloaded keyword. The caller owns (and must close)
+    the returned HDU list.
+
+    Args:
+        input_base (Path): Base of path to files w/ stamp data
+
+    Returns:
+        tuple: (hdu, srcdb) in the form expected by the preloaded argument.
+    """
+    hdu = fits.open(input_base.with_suffix('.rdx.fits'))
+    srcdb = _load_srcdb(input_base.with_suffix('.src.db'))
+    return hdu, srcdb
+
+
+def fit_psf_stack(input_base, num_images, fittype='ellip', ofile=None,
+                  preloaded=None):
     """
     Fit one PSF to the stack of all sources found in the directory specified,
     and save this information to relevant files
@@ -35,14 +105,16 @@ def fit_psf_stack(input_base, num_images, fittype='ellip', ofile=None):
         num_images (int): Number of images to process.
         fittype (str, optional): Type of model to fit ('ellip' or 'circ')
         ofile (str, optional): Output file path.
+        preloaded (tuple, optional): (hdu, srcdb) from load_psf_inputs().
         
     Returns:
         ndarray: Fit of all sources stacked (fit.par = parameters)
     """
     return fit_psf_generic('stack', input_base, num_images, fittype, 
-                           ofile=ofile)
+                           ofile=ofile, preloaded=preloaded)
 
-def fit_psf_single(input_base, num_images, fittype='ellip', sigma_clip=True):
+def fit_psf_single(input_base, num_images, fittype='ellip', sigma_clip=True,
+                   preloaded=None, return_fit_objs=False):
     """
     Fit a PSF to each source found in the directory specified, and return the
     source coordinates, fit parameters, and image number
@@ -52,17 +124,25 @@ def fit_psf_single(input_base, num_images, fittype='ellip', sigma_clip=True):
         num_images (int): Number of images to process.
         fittype (str, optional): Type of model to fit ('ellip' or 'circ')
         sigma_clip (bool, optional): If True, remove PSF fit sources w/ unusual FWHM
+        preloaded (tuple, optional): (hdu, srcdb) from load_psf_inputs().
+        return_fit_objs (bool, optional): If True, return the fit objects
+            instead of the parameter array. The objects hold the stamp and
+            coordinate arrays, so only request them when needed (e.g. for
+            plotting).
         
     Returns:
         ndarray: Coordinates of all sources
-        ndarray: Fits of all sources (fit.par = parameters)
+        ndarray: Fit parameters of all sources, (nsrc, npar); fit objects
+                 instead if return_fit_objs is True
         ndarray: Image number of all sources
     """
     return fit_psf_generic('single', input_base, num_images, fittype, 
-                           sigma_clip=sigma_clip, ofile=None)
+                           sigma_clip=sigma_clip, ofile=None,
+                           preloaded=preloaded, return_fit_objs=return_fit_objs)
 
 def fit_psf_generic(mode, input_base, num_images, fittype='ellip', 
-                    sigma_clip=True, ofile=None):
+                    sigma_clip=True, ofile=None, preloaded=None,
+                    return_fit_objs=False):
     """
     Generic function to fit PSFs to images.
 
@@ -73,6 +153,10 @@ def fit_psf_generic(mode, input_base, num_images, fittype='ellip',
         fittype (str, optional): Type of model to fit ('ellip' or 'circ')
         sigma_clip (bool, optional): If True, remove PSF fit sources w/ unusual FWHM
         ofile (str, optional): Output file path for 'stack' mode.
+        preloaded (tuple, optional): (hdu, srcdb) from load_psf_inputs();
+            skips the FITS open and source database parse when provided.
+        return_fit_objs (bool, optional): In 'single' mode, return the fit
+            objects rather than the parameter array.
     """
     if fittype == 'ellip':
         fitter = FitEllipticalMoffat2D  # Type of fitting function to use
@@ -89,9 +173,12 @@ def fit_psf_generic(mode, input_base, num_images, fittype='ellip',
     ofits = input_base.with_suffix('.rdx.fits')  # Path to FITS file
     src_ofile = input_base.with_suffix('.src.db')  # Path to source database file
 
-    # Load data from FITS and source files
-    hdu = fits.open(ofits)  # Open FITS file
-    srcdb = np.genfromtxt(src_ofile, dtype=float)  # Load source database
+    # Load data from FITS and source files, unless the caller already did
+    if preloaded is None:
+        hdu = fits.open(ofits)  # Open FITS file
+        srcdb = _load_srcdb(src_ofile)  # Load source database
+    else:
+        hdu, srcdb = preloaded
 
     # Pull stamp shape and width from FITS file
     stamp_shape = tuple(hdu['STAMPS_01'].data.shape[1:])  # Shape of the stamp images
@@ -103,75 +190,68 @@ def fit_psf_generic(mode, input_base, num_images, fittype='ellip',
         psf_sum_stack = np.zeros((num_images,) + stamp_shape, dtype=float)
         psf_sum_model = np.zeros((num_images,) + stamp_shape, dtype=float)
         psf_sum_model_par = np.zeros((num_images, num_pars), dtype=float)
-    
-    # Initialize arrays for 'single' mode
+
+    if preloaded is None:
+        hdu.close()  # Close the FITS file; each worker reopens its own handle
+        # ^ interrupting code during run may leave hdu open--just restart kernel
+
+    # Warm the numba JIT on a dummy stamp so the compile cost is paid once
+    # here (and cached for the workers) rather than inside the fitting loop
+    warm = fitter(np.ones(stamp_shape, dtype=float))
+    warm.resid(warm.par)
+    warm.deriv_resid(warm.par)
+
+    # Bucket the srcdb rows by image once (stable sort keeps stamp order),
+    # rather than re-scanning the full table for every image
+    chip_ids = srcdb[:,0].astype(int)
+    order = np.argsort(chip_ids, kind='stable')
+    bounds = np.searchsorted(chip_ids[order], np.arange(1, num_images+2))
+    per_image_rows = [order[bounds[i]:bounds[i+1]] for i in range(num_images)]
+
+    # Process each image; images are independent, so multi-image runs are
+    # dispatched one image per worker process
+    fit_image = partial(_fit_one_image, ofits=ofits, srcdb=srcdb,
+                        per_image_rows=per_image_rows, indx=indx,
+                        mode=mode, fittype=fittype, stamp_width=stamp_width,
+                        return_fit_objs=return_fit_objs)
+    if num_images > 1:
+        with Pool(processes=min(num_images, os.cpu_count())) as pool:
+            results = dict(pool.imap_unordered(fit_image, range(num_images)))
+    else:
+        results = dict(map(fit_image, range(num_images)))
+
+    # Collect the per-image results back into image order
+    if mode == 'stack':
+        for i in range(num_images):
+            psf_sum_stack[i,...], psf_sum_model[i,...], psf_sum_model_par[i,...], fit \
+                    = results[i]
     elif mode == 'single':
-        centroid_coords = []  # List to store centroid coordinates
-        fit_pars = []  # List to store fit parameters
-        fit_objs = []
-        source_images = []  # List to store the image number of all sources
-        
+        # Preallocate typed result arrays sized to the selected sources and
+        # write by index, rather than growing python lists and re-copying
+        # them through np.array at the end
+        n_total = sum(int(indx[rows].sum()) for rows in per_image_rows)
+        centroid_coords = np.empty((n_total, 2), dtype=np.float64)
+        fit_pars = np.empty((n_total, num_pars), dtype=np.float64)
+        fit_objs = np.empty(n_total, dtype=object) if return_fit_objs else None
+        source_images = np.empty(n_total, dtype=np.int32)
+        write_idx = 0
+        for i in range(num_images):
+            img_coords, img_pars, img_objs = results[i]
+            n = len(img_pars)
+            centroid_coords[write_idx:write_idx+n] = img_coords
+            fit_pars[write_idx:write_idx+n] = img_pars
+            if return_fit_objs:
+                fit_objs[write_idx:write_idx+n] = img_objs
+            source_images[write_idx:write_idx+n] = i
+            write_idx += n
+        # Workers skip stamps whose fits fail, so trim to what was written
+        centroid_coords = centroid_coords[:write_idx]
+        fit_pars = fit_pars[:write_idx]
+        source_images = source_images[:write_idx]
+        # The parameter table is the default payload; the fit objects hold
+        # the full stamp/coordinate arrays and are only kept on request
+        payload = fit_objs[:write_idx] if return_fit_objs else fit_pars
 
-    # Process each image
-    for i in range(num_images):
-        on_chip = (srcdb[:,0] == i+1)
-        stamp_indx = np.full(on_chip.size, -1, dtype=int)
-        stamp_indx[on_chip] = np.arange(np.sum(on_chip))
-        ext = f'STAMPS_{i+1:02}'  # Extension name for FITS file
-        in_q = on_chip & indx
-        
-        # Initial parameters for Moffat function
-        default_fwhm = 8
-        alpha = 3.5
-        gamma = default_fwhm / 2 / np.sqrt(2**(1/alpha)-1)
-        
-        def get_p0(fittype, stamp):
-            if fittype == 'ellip':
-                return np.array([float(stamp_width//2), float(stamp_width//2),
-                                 np.amax(stamp[i]), gamma, gamma, 0.0,
-                                 alpha, 0.0])
-            elif fittype == 'circ':
-                return np.array([float(stamp_width//2), float(stamp_width//2),
-                                 np.amax(stamp[i]), gamma, alpha, 0.0])
-        
-        if mode == 'stack':
-            # Stack mode: Sum the stamps and divide by flux before fitting
-            psf_sum_stack[i,...] = np.sum(hdu[ext].data[stamp_indx[in_q]], axis=0) \
-                                        / np.sum(srcdb[in_q,7])
-            # Initial guess for Moffat parameters
-            p0 = get_p0(fittype, psf_sum_stack[i])
-            
-            fit = fitter(psf_sum_stack[i])  # Initialize fit object
-            fit.fit(p0=p0)  # Perform the fit
-            psf_sum_model[i,...] = fit.model()  # Get the model image
-            psf_sum_model_par[i,...] = fit.par  # Get the fit parameters
-        
-        elif mode == 'single':
-            # Single mode: Fit each individual stamp
-            for step_num, stamp_img in enumerate(hdu[ext].data[stamp_indx[in_q]]):
-                # Initial guess for Moffat parameters
-                p0 = get_p0(fittype, stamp_img)
-                
-                fit = fitter(stamp_img)  # Initialize fit object
-                try:
-                    fit.fit(p0=p0)  # Perform the fit
-                except ValueError:
-                    continue
-                fit_par = fit.par  # Get the fit parameters
-                
-                # Find centroid coordinates
-                condition = (srcdb[:, 0] == i+1) & (srcdb[:, 1] == step_num)
-                centroid_x = srcdb[condition][0][2]
-                centroid_y = srcdb[condition][0][3]
-                
-                centroid_coords.append((centroid_x, centroid_y))  # Store coordinates
-                fit_pars.append(fit_par)  # Store fit parameters
-                fit_objs.append(fit)
-                source_images.append(i)
-            
-    hdu.close()  # Close the FITS file
-    # ^ interrupting code during run may leave hdu open--just restart kernel
-    
     if mode == 'stack':
         # Save the results to a new FITS file
         fits.HDUList([fits.PrimaryHDU(),
@@ -183,39 +263,116 @@ def fit_psf_generic(mode, input_base, num_images, fittype='ellip',
     
     elif mode == 'single':
         # Eliminate sources with irregular FWHMs
-        fit_pars = np.array(fit_pars)
-        fit_objs = np.array(fit_objs)
-        source_images = np.array(source_images)
-        centroid_coords = np.array(centroid_coords)
-        
         if not sigma_clip:
-            return centroid_coords, fit_objs, source_images
+            return centroid_coords, payload, source_images
         else:
+            # Clip both FWHMs upfront and combine into a single keep mask, so
+            # each output array is fancy-indexed exactly once. Median/MAD
+            # centering is robust to the outliers being clipped, and the
+            # unmasked output skips the MaskedArray construction on every
+            # iteration; axis=0 keeps the output full-length with NaNs in
+            # place of clipped values rather than compressing it
+            sigma_clipper = SigmaClip(sigma=4, maxiters=5, cenfunc='median',
+                                      stdfunc='mad_std')
             if fittype == 'ellip':
                 fwhm1 = FitMoffat2D.to_fwhm(fit_pars[:,3], fit_pars[:,6])
+                fwhm2 = FitMoffat2D.to_fwhm(fit_pars[:,4], fit_pars[:,6])
+                keep = ~np.isnan(sigma_clipper(fwhm1, masked=False, copy=False,
+                                               axis=0)) \
+                        & ~np.isnan(sigma_clipper(fwhm2, masked=False,
+                                                  copy=False, axis=0))
             elif fittype == 'circ':
                 fwhm1 = FitMoffat2D.to_fwhm(fit_pars[:,3], fit_pars[:,4])
-            
-            # Create a SigmaClip object and apply it to get a mask
-            sigma_clipper = SigmaClip(sigma=4, maxiters=5)
-            masked_fwhm1 = sigma_clipper(fwhm1)
-            clipped_fit_pars = fit_pars[~masked_fwhm1.mask]
-            clipped_fit_objs = fit_objs[~masked_fwhm1.mask]
-            clipped_coords = centroid_coords[~masked_fwhm1.mask]
-            clipped_source_images = source_images[~masked_fwhm1.mask]
-            
-            if fittype == 'ellip':
-                fwhm2 = FitMoffat2D.to_fwhm(clipped_fit_pars[:,4], clipped_fit_pars[:,6])
-                masked_fwhm2 = sigma_clipper(fwhm2)
-                clipped_fit_pars = clipped_fit_pars[~masked_fwhm2.mask]
-                clipped_fit_objs = clipped_fit_objs[~masked_fwhm2.mask]
-                clipped_coords = clipped_coords[~masked_fwhm2.mask]
-                clipped_source_images = clipped_source_images[~masked_fwhm2.mask]
-            
-            logger.info(f"Number of sources removed in sigma clipping = {len(fit_pars) - len(clipped_fit_objs)}")
-            logger.info(f"Number of sources remaining = {len(clipped_fit_objs)}")
-            
-            return clipped_coords, clipped_fit_objs, clipped_source_images
+                keep = ~np.isnan(sigma_clipper(fwhm1, masked=False, copy=False,
+                                               axis=0))
+
+            logger.info(f"Number of sources removed in sigma clipping = {len(fit_pars) - np.sum(keep)}")
+            logger.info(f"Number of sources remaining = {np.sum(keep)}")
+
+            return centroid_coords[keep], payload[keep], source_images[keep]
+
+
+def _fit_one_image(i, ofits, srcdb, per_image_rows, indx, mode, fittype,
+                   stamp_width, return_fit_objs=False):
+    """
+    Fit PSFs to the stamps of a single image. Worker for the process pool
+    in fit_psf_generic; opens its own FITS handle so nothing is shared
+    across processes.
+
+    Args:
+        i (int): Image index (0-based).
+        ofits (Path): Path to the FITS file w/ stamp data.
+        srcdb (ndarray): Source database.
+        per_image_rows (list): srcdb row indices for each image, in stamp order.
+        indx (ndarray): Boolean selection criteria over srcdb rows.
+        mode (str): Mode of fitting ('stack' or 'single').
+        fittype (str): Type of model to fit ('ellip' or 'circ')
+        stamp_width (int): Width of the stamps.
+        return_fit_objs (bool): If True, 'single' mode results include the
+            fit objects; otherwise that slot is None, which also avoids
+            pickling the objects (and their stamp arrays) back through the
+            process pool.
+
+    Returns:
+        tuple: The image index and its results. For 'stack' mode, results are
+               (psf_stack, psf_model, model_par, fit); for 'single' mode,
+               (centroid_coords, fit_pars, fit_objs).
+    """
+    fitter = FitEllipticalMoffat2D if fittype == 'ellip' else FitMoffat2D
+
+    rows = per_image_rows[i]  # srcdb rows for this image, in stamp order
+    sel = indx[rows]  # Selection criteria over this image's stamps
+    ext = f'STAMPS_{i+1:02}'  # Extension name for FITS file
+
+    with fits.open(ofits) as hdu:
+        # Pull the selected stamps out of the memory-mapped extension in one
+        # contiguous float64 block, so the jitted fitters get cache-friendly
+        # input instead of page-faulting through the mmap per stamp
+        stamps = np.ascontiguousarray(hdu[ext].data[sel], dtype=np.float64)
+
+    if mode == 'stack':
+        # Stack mode: Sum the stamps and divide by flux before fitting
+        psf_stack = np.sum(stamps, axis=0) / np.sum(srcdb[rows[sel],7])
+        # Initial guess for Moffat parameters
+        p0 = _get_p0(fittype, psf_stack, stamp_width)
+
+        fit = fitter(psf_stack)  # Initialize fit object
+        fit.fit(p0=p0)  # Perform the fit
+        return i, (psf_stack, fit.model(), fit.par, fit)
+
+    elif mode == 'single':
+        sel_rows = rows[sel]  # srcdb row of each selected stamp
+        num_pars = 8 if fittype == 'ellip' else 6
+
+        # Preallocate typed outputs sized to the selected stamps; fits that
+        # fail are skipped, so track how many entries are actually written
+        centroid_coords = np.empty((len(sel_rows), 2), dtype=np.float64)
+        fit_pars = np.empty((len(sel_rows), num_pars), dtype=np.float64)
+        fit_objs = np.empty(len(sel_rows), dtype=object) if return_fit_objs \
+                        else None
+        n_fit = 0
+
+        # Single mode: Fit each individual stamp
+        for step_num, stamp_img in enumerate(stamps):
+            # Initial guess for Moffat parameters
+            p0 = _get_p0(fittype, stamp_img, stamp_width)
+
+            fit = fitter(stamp_img)  # Initialize fit object
+            try:
+                fit.fit(p0=p0)  # Perform the fit
+            except ValueError:
+                continue
+
+            # Centroid coordinates come straight from the stamp's srcdb row
+            centroid_coords[n_fit, 0] = srcdb[sel_rows[step_num], 2]
+            centroid_coords[n_fit, 1] = srcdb[sel_rows[step_num], 3]
+            fit_pars[n_fit] = fit.par
+            if return_fit_objs:
+                fit_objs[n_fit] = fit
+            n_fit += 1
+
+        return i, (centroid_coords[:n_fit], fit_pars[:n_fit],
+                   fit_objs[:n_fit] if return_fit_objs else None)
 
 
 def get_source_pars(path_list, category_str=None, fittype='ellip'):
@@ -256,8 +413,7 @@ def get_source_pars(path_list, category_str=None, fittype='ellip'):
     generate_stamps(images, output_base=base)
 
     # Fit PSF models and get source coordinates and parameters
-    source_coords, source_fits, img_nums = fit_psf_single(base, len(images))
-    source_pars = np.array([fit.par for fit in source_fits])
+    source_coords, source_pars, img_nums = fit_psf_single(base, len(images))
     return source_coords, source_pars, img_nums
 
 
@@ -345,36 +501,37 @@ def get_param_list(param_type, pars, shape, img_nums=None):
     ValueError
         If the input `param_type` is not 'fwhm', 'phi', 'ecc', or 'fwhm residuals'.
     """
+    # Both FWHMs share the same alpha-dependent factor, so compute the
+    # transcendental part once per source rather than once per axis
+    if param_type in ('fwhm', 'fwhm residuals', 'ecc'):
+        fwhm_factor = 2 * np.sqrt(2**(1.0/pars[:, 6]) - 1)
+
     if param_type == 'fwhm':
         # Calculate FWHM (average between semi-major and minor axes)
-        param_list = (FitMoffat2D.to_fwhm(pars[:, 3], pars[:, 6]) +
-                      FitMoffat2D.to_fwhm(pars[:, 4], pars[:, 6])) / 2 * plate_scale_approx
+        param_list = (pars[:, 3] + pars[:, 4]) * fwhm_factor / 2 * plate_scale_approx
         color_range = [1.5, 2.7]  # Optimized for Nickel 06-26-24 data
         title = "FWHM (arcsec)"
     elif param_type == 'fwhm residuals':
         # Calculate FWHM residual (relative to minimum FWHM in image)
-        fwhm_list = (FitMoffat2D.to_fwhm(pars[:, 3], pars[:, 6]) +
-                     FitMoffat2D.to_fwhm(pars[:, 4], pars[:, 6])) / 2
-        mins = {img_num: np.min(fwhm_list[img_nums == img_num])
-                for img_num in list(set(img_nums))}
-        param_list = np.array([fwhm_list[i] - mins[img_num]
-                               for i, img_num in enumerate(img_nums)]) * plate_scale_approx
+        fwhm_list = (pars[:, 3] + pars[:, 4]) * fwhm_factor / 2
+        # Group-wise minimum FWHM per image via a sorted reduceat
+        uniq, inverse = np.unique(img_nums, return_inverse=True)
+        order = np.argsort(img_nums, kind='stable')
+        starts = np.searchsorted(img_nums[order], uniq)
+        mins = np.minimum.reduceat(fwhm_list[order], starts)
+        param_list = (fwhm_list - mins[inverse]) * plate_scale_approx
         color_range = [0.0, 0.36]
         title = "FWHM Residuals (arcsec)"
     elif param_type == 'phi':
         # Convert phi rotation angle relative to x-axis from the original phi
-        param_list = np.array([FitEllipticalMoffat2D.get_nice_phi(smooth_par)
-                               for smooth_par in pars])
+        param_list = FitEllipticalMoffat2D.get_nice_phis(pars)
         color_range = [-45., 45.]
         title = "Phi Rotation Angle (deg)"
     elif param_type == 'ecc':
         # Calculate eccentricity
-        param_list = []
-        for smooth_par in pars:
-            fwhm1 = FitMoffat2D.to_fwhm(smooth_par[3], smooth_par[6])
-            fwhm2 = FitMoffat2D.to_fwhm(smooth_par[4], smooth_par[6])
-            param_list.append(np.sqrt(np.abs(fwhm1 ** 2 - fwhm2 ** 2)) / max(fwhm1, fwhm2))
-        param_list = np.array(param_list)
+        fwhm1 = pars[:, 3] * fwhm_factor
+        fwhm2 = pars[:, 4] * fwhm_factor
+        param_list = np.sqrt(np.abs(fwhm1 ** 2 - fwhm2 ** 2)) / np.maximum(fwhm1, fwhm2)
         color_range = [0.29, 0.65]  # Optimized for Nickel 06-26-24 data
         title = "Eccentricity"
     else:
@@ -384,7 +541,8 @@ def get_param_list(param_type, pars, shape, img_nums=None):
     return param_list, color_range, title
 
 
-def psf_plot(plot_file, fit, fittype='ellip', show=False, plot_fit=True):
+def psf_plot(plot_file, fit, fittype='ellip', show=False, plot_fit=True,
+             fig=None):
     """
     Plot the PSF fitting results and save to a PDF
 
@@ -392,14 +550,22 @@ def psf_plot(plot_file, fit, fittype='ellip', show=False, plot_fit=True):
         plot_file (str): Output PDF file path.
         fit (object): Fitting results.
         verbose (bool, optional): If True, print detailed output during processing.
+        fig (Figure, optional): Figure to draw into. Pass the same figure to
+            repeated calls to reuse it across pages instead of paying figure
+            setup/teardown per call; the caller is responsible for closing it.
     """
     if fittype != 'ellip':
         raise ValueError(f"psf_plot() not yet implemented for fittype={fittype}")
     with PdfPages(plot_file) as pdf:
-        # Set up the figure
+        # Set up the figure, reusing the caller's (cleared) figure if given
         w, h = plt.figaspect(1.)
-        fig = plt.figure(figsize=(1.5*w,1.5*h))
-        plt.suptitle(plot_file.stem)  # Set the title of the plot
+        owns_fig = fig is None
+        if owns_fig:
+            fig = plt.figure(figsize=(1.5*w,1.5*h))
+        else:
+            fig.clear()
+            fig.set_size_inches(1.5*w, 1.5*h)
+        fig.suptitle(plot_file.stem)  # Set the title of the plot
 
         stack = fit.c  # Observed stack
         model = fit.model()  # Model stack
@@ -420,32 +586,28 @@ def psf_plot(plot_file, fit, fittype='ellip', show=False, plot_fit=True):
         ell_x += fit.par[0]  # Offset ellipse in x
         ell_y += fit.par[1]  # Offset ellipse in y
             
-        # Normalize the images for better visualization
-        norm = ImageNormalize(np.concatenate((stack, model, stack-model)),
-                              interval=ZScaleInterval(contrast=0.10),
+        resid = stack - model  # Computed once and shared by the panels below
+
+        # Normalize the images for better visualization; the model and
+        # residual share the stack's physical scale, so ZScale the stack
+        # alone with a bounded internal sample instead of concatenating
+        norm = ImageNormalize(stack,
+                              interval=ZScaleInterval(contrast=0.10,
+                                                      n_samples=1000),
                               stretch=AsinhStretch())
 
-        # Plot observed stack
-        ax = fig.add_axes([0.03, 0.7, 0.2, 0.2])
-        ax.imshow(stack, origin='lower', interpolation='nearest', norm=norm)
-        ax.contour(stack, [amp/8, amp/4, amp/2, amp/1.1], colors='k', linewidths=0.5)
-        ax.set_axis_off()
-        ax.text(0.5, 1.01, 'Observed', ha='center', va='bottom', transform=ax.transAxes)
-
-        # Plot model stack
-        ax = fig.add_axes([0.24, 0.7, 0.2, 0.2])
-        ax.imshow(model, origin='lower', interpolation='nearest', norm=norm)
-        ax.contour(model, [amp/8, amp/4, amp/2, amp/1.1], colors='k', linewidths=0.5)
-        ax.plot(ell_x, ell_y, color='C3', lw=0.5)
-        ax.set_axis_off()
-        ax.text(0.5, 1.01, 'Model', ha='center', va='bottom', transform=ax.transAxes)
-
-        # Plot residuals
-        ax = fig.add_axes([0.45, 0.7, 0.2, 0.2])
-        ax.imshow(stack-model, origin='lower', interpolation='nearest', norm=norm)
-        ax.contour(stack-model, [-amp/40, amp/40], colors=['w','k'], linewidths=0.5)
-        ax.set_axis_off()
-        ax.text(0.5, 1.01, 'Residual', ha='center', va='bottom', transform=ax.transAxes)
+        # Plot observed stack, model stack, and residuals with a shared norm
+        panels = [('Observed', stack, [amp/8, amp/4, amp/2, amp/1.1], 'k'),
+                  ('Model', model, [amp/8, amp/4, amp/2, amp/1.1], 'k'),
+                  ('Residual', resid, [-amp/40, amp/40], ['w','k'])]
+        for n, (label, img, levels, colors) in enumerate(panels):
+            ax = fig.add_axes([0.03 + 0.21*n, 0.7, 0.2, 0.2])
+            ax.imshow(img, origin='lower', interpolation='nearest', norm=norm)
+            ax.contour(img, levels, colors=colors, linewidths=0.5)
+            if label == 'Model':
+                ax.plot(ell_x, ell_y, color='C3', lw=0.5)
+            ax.set_axis_off()
+            ax.text(0.5, 1.01, label, ha='center', va='bottom', transform=ax.transAxes)
 
         # Plot 1D profiles of source data and model
         r = np.sqrt((fit.x - fit.par[0])**2 + (fit.y - fit.par[1])**2).ravel()
@@ -485,14 +647,11 @@ def psf_plot(plot_file, fit, fittype='ellip', show=False, plot_fit=True):
                     transform=ax.transAxes)
         ax.text(0.5, -0.15, 'R [pix]', ha='center', va='top', transform=ax.transAxes)
             
-        pdf.savefig()  # Save the figure to the PDF
+        pdf.savefig(fig)  # Save the figure to the PDF
         if show:
             plt.show()  # Display the plot
-            try:
-                fig.clear()
-            except:
-                pass
-        plt.close()
+        if owns_fig:
+            plt.close(fig)
 
 
 def plot_sources(phot_data, given_fwhm, image=None, flux_name='flux_fit',
@@ -556,32 +715,40 @@ def plot_sources(phot_data, given_fwhm, image=None, flux_name='flux_fit',
     cmap.set_bad('r', alpha=0.5)
     
     # Plot the image and the good/bad sources
-    plt.figure(figsize=(12,10))
-    plt.title(image)
-    plt.imshow(image.masked_array, origin='lower', vmin=vmin, vmax=vmax,
-               cmap=cmap, interpolation='nearest')
-    plt.colorbar()
-    good_apertures.plot(color='purple', lw=1.5*scale, alpha=1)
-    bad_apertures.plot(color='r', lw=1.5*scale, alpha=1)
-    
-    # Annotate singular sources with label_name and flux_name values
+    fig, ax = plt.subplots(figsize=(12,10))
+    ax.set_title(str(image))
+    im = ax.imshow(image.masked_array, origin='lower', vmin=vmin, vmax=vmax,
+                   cmap=cmap, interpolation='nearest')
+    fig.colorbar(im, ax=ax)
+    good_apertures.plot(ax=ax, color='purple', lw=1.5*scale, alpha=1)
+    bad_apertures.plot(ax=ax, color='r', lw=1.5*scale, alpha=1)
+
+    # Annotate singular sources with label_name and flux_name values; pull the
+    # columns out as plain arrays once rather than indexing the Table per row,
+    # and annotate on the captured Axes to skip the repeated gca() lookups
     y_offset = 3.5*given_fwhm*scale
-    for i in range(len(good_phot_data)):
-        plt.text(good_phot_data[x_name][i], good_phot_data[y_name][i]+y_offset, 
-                 f'{good_phot_data[label_name][i]}: {good_phot_data[flux_name][i]:.0f}',
-                 color='white', fontsize=8*scale, ha='center', va='center')
-    
+    good_x = np.asarray(good_phot_data[x_name])
+    good_y = np.asarray(good_phot_data[y_name]) + y_offset
+    good_labels = [f'{lbl}: {flx:.0f}' for lbl, flx
+                   in zip(good_phot_data[label_name], good_phot_data[flux_name])]
+    for x, y, text in zip(good_x, good_y, good_labels):
+        ax.annotate(text, (x, y), color='white', fontsize=8*scale,
+                    ha='center', va='center', annotation_clip=False)
+
     # Annotate grouped sources with label_name and flux_name values in one large stack
-    group_ids = set(bad_phot_data[label_name])
-    for id in group_ids:
-        group = bad_phot_data[bad_phot_data[label_name] == id]
-        group_x = np.median(group[x_name])
-        group_y = np.median(group[y_name]) + y_offset
-        for i in range(len(group)):
-            plt.text(group_x, group_y+i*20*scale, 
-                     f'{id}: {group[flux_name][i]:.0f}',
-                     color='red', fontsize=8*scale, ha='center', va='center')
+    bad_labels = np.asarray(bad_phot_data[label_name])
+    bad_x = np.asarray(bad_phot_data[x_name])
+    bad_y = np.asarray(bad_phot_data[y_name])
+    bad_flux = np.asarray(bad_phot_data[flux_name])
+    for id in np.unique(bad_labels):
+        in_group = bad_labels == id
+        group_x = np.median(bad_x[in_group])
+        group_y = np.median(bad_y[in_group]) + y_offset
+        for i, flx in enumerate(bad_flux[in_group]):
+            ax.annotate(f'{id}: {flx:.0f}', (group_x, group_y+i*20*scale),
+                        color='red', fontsize=8*scale, ha='center', va='center',
+                        annotation_clip=False)
     
     # Show plot
-    plt.gcf().set_dpi(300)
+    fig.set_dpi(300)
     plt.show()
\ No newline at end of file
@@ -4,12 +4,199 @@
 #############################################
 
 import numpy as np
+from functools import lru_cache
+from numba import njit
 from scipy import optimize
 
 from astropy.modeling.functional_models import Moffat2D, Fittable2DModel
 from astropy.modeling.parameters import Parameter
 from astropy.units import UnitsError
 
+
+@lru_cache(maxsize=8)
+def _get_xy(shape):
+    """
+    Build (and memoize) the pixel coordinate grids for a stamp shape. All
+    stamps in a run share one shape, so every fitter instance reuses the
+    same read-only arrays instead of rebuilding the meshgrid per source.
+
+    Args:
+        shape (tuple): Shape of the stamp image.
+
+    Returns:
+        tuple: (x, y, xf, yf) -- the 2D coordinate grids and their raveled,
+               contiguous float64 counterparts.
+    """
+    x, y = np.meshgrid(np.arange(shape[0]).astype(float),
+                       np.arange(shape[1]).astype(float))
+    xf = np.ascontiguousarray(x.ravel())
+    yf = np.ascontiguousarray(y.ravel())
+    # The 2D grids are shared views and marked read-only; the raveled copies
+    # stay writable because the jitted kernels' signatures require it
+    x.setflags(write=False)
+    y.setflags(write=False)
+    return x, y, xf, yf
+
+
+@njit(cache=True, fastmath=True)
+def _to_gamma(fwhm, alpha):
+    """
+    Jit-compiled conversion from full-width half-maximum (FWHM) to gamma;
+    works on scalars and arrays alike.
+    """
+    return fwhm / 2 / np.sqrt(2**(1/alpha)-1)
+
+
+@njit(cache=True, fastmath=True)
+def _to_fwhm(gamma, alpha):
+    """
+    Jit-compiled conversion from gamma to full-width half-maximum (FWHM);
+    works on scalars and arrays alike.
+    """
+    return 2 * gamma * np.sqrt(2**(1/alpha)-1)
+
+
+# The residual/Jacobian kernels carry explicit signatures so numba compiles
+# them eagerly at import (numba.pycc AOT compilation is no longer available);
+# with cache=True the compiled code persists on disk, so only the very first
+# import pays the LLVM compile cost and later imports just load the cache.
+@njit('f8[::1](f8[::1], f8[::1], f8[::1], f8[::1])', cache=True, fastmath=True)
+def _moffat_resid(par, x, y, c):
+    """
+    Jit-compiled residuals between the data and a circular Moffat model.
+
+    Args:
+        par (ndarray): Model parameters.
+                       (x0, y0, amplitude, gamma, alpha, background)
+        x (ndarray): Raveled x-coordinate values.
+        y (ndarray): Raveled y-coordinate values.
+        c (ndarray): Raveled data values.
+
+    Returns:
+        ndarray: Residuals (data - model) at each coordinate.
+    """
+    dx = x - par[0]
+    dy = y - par[1]
+    D = 1 + (dx**2 + dy**2) / par[3]**2
+    return c - par[2] / D**par[4] - par[5]
+
+
+@njit('f8[:,::1](f8[::1], f8[::1], f8[::1])', cache=True, fastmath=True)
+def _moffat_jac(par, x, y):
+    """
+    Jit-compiled Jacobian of the circular Moffat residuals with respect
+    to the parameters.
+
+    Args:
+        par (ndarray): Model parameters.
+                       (x0, y0, amplitude, gamma, alpha, background)
+        x (ndarray): Raveled x-coordinate values.
+        y (ndarray): Raveled y-coordinate values.
+
+    Returns:
+        ndarray: (npix, 6) array of residual derivatives.
+    """
+    dx = x - par[0]
+    dy = y - par[1]
+    D = 1 + (dx**2 + dy**2) / par[3]**2
+    I = par[2] / D**par[4]
+    f = -par[4] / D
+
+    jac = np.empty((x.size, 6), dtype=np.float64)
+    jac[:,0] = f * I * (-2*dx/par[3]**2)
+    jac[:,1] = f * I * (-2*dy/par[3]**2)
+    jac[:,2] = I / par[2]
+    jac[:,3] = f * I * (-2*(dx**2 + dy**2)/par[3]**3)
+    jac[:,4] = -I * np.log(D)
+    jac[:,5] = np.full(x.size, 1., dtype=np.float64)
+    return -jac
+
+
+@njit('f8[::1](f8[::1], f8[::1], f8[::1], f8[::1])', cache=True, fastmath=True)
+def _elliptical_moffat_resid(par, x, y, c):
+    """
+    Jit-compiled residuals between the data and an elliptical Moffat model.
+
+    Args:
+        par (ndarray): Model parameters.
+                       (x0, y0, amplitude, gamma1, gamma2, phi, alpha, background)
+        x (ndarray): Raveled x-coordinate values.
+        y (ndarray): Raveled y-coordinate values.
+        c (ndarray): Raveled data values.
+
+    Returns:
+        ndarray: Residuals (data - model) at each coordinate.
+    """
+    cosr = np.cos(par[5])
+    sinr = np.sin(par[5])
+    A = (cosr/par[3])**2 + (sinr/par[4])**2
+    B = (sinr/par[3])**2 + (cosr/par[4])**2
+    C = 2 * sinr * cosr * (par[3]**-2 - par[4]**-2)
+    dx = x - par[0]
+    dy = y - par[1]
+    D = 1 + A*dx**2 + B*dy**2 + C*dx*dy
+    return c - par[2] / D**par[6] - par[7]
+
+
+@njit('f8[:,::1](f8[::1], f8[::1], f8[::1])', cache=True, fastmath=True)
+def _elliptical_moffat_jac(par, x, y):
+    """
+    Jit-compiled Jacobian of the elliptical Moffat residuals with respect
+    to the parameters.
+
+    Args:
+        par (ndarray): Model parameters.
+                       (x0, y0, amplitude, gamma1, gamma2, phi, alpha, background)
+        x (ndarray): Raveled x-coordinate values.
+        y (ndarray): Raveled y-coordinate values.
+
+    Returns:
+        ndarray: (npix, 8) array of residual derivatives.
+    """
+    cosr = np.cos(par[5])
+    sinr = np.sin(par[5])
+
+    a1 = (cosr/par[3])**2
+    a2 = (sinr/par[4])**2
+    A = a1 + a2
+    dA_dg1 = -2*a1/par[3]
+    dA_dg2 = -2*a2/par[4]
+
+    b1 = (sinr/par[3])**2
+    b2 = (cosr/par[4])**2
+    B = b1 + b2
+    dB_dg1 = -2*b1/par[3]
+    dB_dg2 = -2*b2/par[4]
+
+    C = 2 * sinr * cosr * (par[3]**-2 - par[4]**-2)
+    dC_dg1 = -4 * sinr * cosr / par[3]**3
+    dC_dg2 = 4 * sinr * cosr / par[4]**3
+
+    dA_dphi = -C
+    dB_dphi = C
+    # d/dphi of 2*sin(phi)*cos(phi) = 2*cos(2*phi); written this way so the
+    # derivative remains finite at phi = 0
+    dC_dphi = 2 * np.cos(2*par[5]) * (par[3]**-2 - par[4]**-2)
+
+    dx = x - par[0]
+    dy = y - par[1]
+
+    D = 1 + A*dx**2 + B*dy**2 + C*dx*dy
+    I = par[2] / D**par[6]
+    f = -par[6] / D
+
+    jac = np.empty((x.size, 8), dtype=np.float64)
+    jac[:,0] = f * I * (-2*A*dx - C*dy)
+    jac[:,1] = f * I * (-2*B*dy - C*dx)
+    jac[:,2] = I / par[2]
+    jac[:,3] = f * I * (dA_dg1*dx**2 + dB_dg1*dy**2 + dC_dg1*dx*dy)
+    jac[:,4] = f * I * (dA_dg2*dx**2 + dB_dg2*dy**2 + dC_dg2*dx*dy)
+    jac[:,5] = f * I * (dA_dphi*dx**2 + dB_dphi*dy**2 + dC_dphi*dx*dy)
+    jac[:,6] = -I * np.log(D)
+    jac[:,7] = np.full(x.size, 1., dtype=np.float64)
+    return -jac
+
+
 class FitMoffat2D:
     """
     Fit a 2D Moffat model to the given data.
@@ -31,8 +218,10 @@ class FitMoffat2D:
         """
         self.c = c
         self.shape = self.c.shape
-        self.x, self.y = np.meshgrid(np.arange(self.shape[0]).astype(float),
-                                        np.arange(self.shape[1]).astype(float))
+        # Coordinate grids are cached per shape; the raveled copies feed the
+        # jit-compiled residual/Jacobian
+        self.x, self.y, self._xf, self._yf = _get_xy(self.shape)
+        self._cf = np.ascontiguousarray(self.c.ravel(), dtype=np.float64)
         self.moff = Moffat2D()
         self.par = self.guess_par()
         self.npar = self.par.size
@@ -113,17 +302,15 @@ class FitMoffat2D:
         """
         Calculate the residuals between the data and the model.
         """
-        return self.c.ravel() - self.model(par).ravel()
+        self._set_par(par)
+        return _moffat_resid(self.par, self._xf, self._yf, self._cf)
 
     def deriv_resid(self, par):
         """
         Calculate the derivative of the residuals with respect to the parameters.
         """
         self._set_par(par)
-        dmoff = self.moff.fit_deriv(self.x.ravel(), self.y.ravel(), self.par[2], self.par[0],
-                                    self.par[1], self.par[3], self.par[4])
-        return np.array([-d for d in dmoff]
-                            + [np.full(np.prod(self.shape), -1., dtype=float)]).T
+        return _moffat_jac(self.par, self._xf, self._yf)[:,self.free]
 
     def fit(self, p0=None, fix=None, lb=None, ub=None):
         """
@@ -156,9 +343,11 @@ class FitMoffat2D:
             raise ValueError('Length of one or both of the bounds vectors is incorrect.')
 
         p = self.par[self.free]
+        # NOTE: 'trf' rather than 'lm' because the fit is bounded; the jitted
+        # residual/Jacobian keep the per-iteration cost out of the interpreter
         result = optimize.least_squares(self.resid, p, method='trf', xtol=1e-12,
                                         bounds=(lb[self.free], ub[self.free]),
-                                        verbose=0) #, jac=self.deriv_resid)
+                                        verbose=0, jac=self.deriv_resid)
         self._set_par(result.x)
 
     @staticmethod
@@ -166,14 +355,14 @@ class FitMoffat2D:
         """
         Convert full-width half-maximum (FWHM) to gamma.
         """
-        return fwhm / 2 / np.sqrt(2**(1/alpha)-1)
+        return _to_gamma(fwhm, alpha)
     
     @staticmethod
     def to_fwhm(gamma, alpha):
         """
         Convert gamma to full-width half-maximum (FWHM).
         """
-        return 2 * gamma * np.sqrt(2**(1/alpha)-1)
+        return _to_fwhm(gamma, alpha)
 
 
 
@@ -200,8 +389,10 @@ class FitEllipticalMoffat2D:
         """
         self.c = c
         self.shape = self.c.shape
-        self.x, self.y = np.meshgrid(np.arange(self.shape[0]).astype(float),
-                                        np.arange(self.shape[1]).astype(float))
+        # Coordinate grids are cached per shape; the raveled copies feed the
+        # jit-compiled residual/Jacobian
+        self.x, self.y, self._xf, self._yf = _get_xy(self.shape)
+        self._cf = np.ascontiguousarray(self.c.ravel(), dtype=np.float64)
         self.par = self.guess_par()
         self.npar = self.par.size
         self.nfree = self.npar
@@ -370,16 +561,15 @@ class FitEllipticalMoffat2D:
         """
         Calculate the residuals between the data and the Moffat model.
         """
-        return self.c.ravel() - self.model(par).ravel()
+        self._set_par(par)
+        return _elliptical_moffat_resid(self.par, self._xf, self._yf, self._cf)
 
     def deriv_resid(self, par):
         """
         Calculate the derivatives of the residuals with respect to the Moffat fit parameters.
         """
         self._set_par(par)
-        dmoff = self._eval_moffat_deriv(self.par, self.x, self.y)
-        return np.array([-d for d in dmoff]
-                            + [np.full(np.prod(self.shape), -1., dtype=float)]).T
+        return _elliptical_moffat_jac(self.par, self._xf, self._yf)[:,self.free]
 
     def fit(self, p0=None, fix=None, lb=None, ub=None):
         """
@@ -416,9 +606,12 @@ class FitEllipticalMoffat2D:
             raise ValueError('Length of one or both of the bounds vectors is incorrect.')
 
         # Perform fit
+        # NOTE: 'trf' rather than 'lm' because the fit is bounded; the jitted
+        # residual/Jacobian keep the per-iteration cost out of the interpreter
         p = self.par[self.free]
         result = optimize.least_squares(self.resid, p, method='trf', xtol=1e-12,
-                                        bounds=(lb[self.free], ub[self.free]))
+                                        bounds=(lb[self.free], ub[self.free]),
+                                        jac=self.deriv_resid)
         # Sets phi to 0 if fit is too circular for phi to be accurate
         new_par = result.x
         if 0.93 < new_par[3]/new_par[4] < 1.07:
@@ -430,14 +623,14 @@ class FitEllipticalMoffat2D:
         """
         Convert full-width half-maximum (FWHM) to gamma.
         """
-        return fwhm / 2 / np.sqrt(2**(1/alpha)-1)
+        return _to_gamma(fwhm, alpha)
 
     @staticmethod
     def to_fwhm(gamma, alpha):
         """
         Convert gamma to full-width half-maximum (FWHM).
         """
-        return 2 * gamma * np.sqrt(2**(1/alpha)-1)
+        return _to_fwhm(gamma, alpha)
 
     @staticmethod
     def get_nice_phi(par):
@@ -460,6 +653,25 @@ class FitEllipticalMoffat2D:
         else:
             return nice_phi
 
+    @staticmethod
+    def get_nice_phis(pars):
+        """
+        Vectorized get_nice_phi: convert phi to angle between semi-major axis
+        and +x-axis in degrees for a whole table of fits at once.
+
+        Args:
+            pars (ndarray): (N, 8) array of fit parameters
+                        (x0, y0, amplitude, gamma1, gamma2, phi, alpha, background)
+
+        Returns:
+            ndarray: Nice phi values in degrees.
+        """
+        nice_phi = np.rad2deg(pars[:,5]) + 0.000000000001
+        swap = pars[:,3] < pars[:,4]
+        return np.where(swap,
+                        np.where(nice_phi > 0.001, nice_phi - 90, nice_phi + 90),
+                        nice_phi)
+
     @staticmethod
     def get_orig_phi(gamma1, gamma2, nice_phi):
         """
@@ -484,6 +696,7 @@ class FitEllipticalMoffat2D:
         original_rad = np.deg2rad(original_phi - 0.000000000001)
         return original_rad
 
+@njit(cache=True, fastmath=True)
 def make_ellipse(a, b, phi, n=500):
     """
     Generate coordinates for an ellipse.
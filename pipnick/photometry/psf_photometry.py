@@ -19,7 +19,7 @@ from pipnick.utils.log import log_astropy_table
 
 from pipnick.photometry.moffat_model import MoffatElliptical2D_photutils
 from pipnick.photometry.starfind import generate_stamps
-from pipnick.photometry.fit import fit_psf_single, fit_psf_stack, psf_plot, plot_sources
+from pipnick.photometry.fit import fit_psf_single, fit_psf_stack, psf_plot, plot_sources, load_psf_inputs
 
 logger = logging.getLogger(__name__)
 np.set_printoptions(edgeitems=100)
@@ -94,14 +94,22 @@ def psf_analysis(image, proc_dir, thresh=10.0, mode='all', fittype='circ',
     table_str = log_astropy_table(sources)
     logger.debug(f"Sources Found (Iter 1): \n{table_str}")
 
-    # Fit PSF models and get source coordinates and parameters
-    source_coords, source_fits, _ = fit_psf_single(base, 1, fittype=fittype, sigma_clip=False)
-    source_pars = np.array([fit.par for fit in source_fits])
+    # Load stamp FITS & source database once; shared by both PSF fit calls
+    preloaded = load_psf_inputs(base)
+
+    # Fit PSF models and get source coordinates and parameters; the fit
+    # objects themselves are only needed to plot intermediate group results
+    source_coords, source_fits, _ = fit_psf_single(base, 1, fittype=fittype, sigma_clip=False,
+                                                   preloaded=preloaded,
+                                                   return_fit_objs=plot_inters)
+    source_pars = np.array([fit.par for fit in source_fits]) if plot_inters \
+                        else source_fits
 
     try:
         # Fit PSF to stack of all sources in image
         psf_file = Path(f'{str(base)}.psf.fits').resolve()  # PSF info stored here
-        stack_par = fit_psf_stack(base, 1, fittype=fittype, ofile=psf_file).par
+        stack_par = fit_psf_stack(base, 1, fittype=fittype, ofile=psf_file,
+                                  preloaded=preloaded).par
         stack_fwhm = process_par(stack_par, 'Stack', fittype=fittype)
         fit_par = stack_par
         fit_fwhm = stack_fwhm
@@ -112,6 +120,8 @@ def psf_analysis(image, proc_dir, thresh=10.0, mode='all', fittype='circ',
         clip_avg_fwhm = process_par(clip_avg_par, 'Clipped Avg', fittype=fittype)
         fit_par = clip_avg_par
         fit_fwhm = clip_avg_fwhm
+    finally:
+        preloaded[0].close()
 
     # Convert initial PSF fit data into Astropy table, calculating flux based on PSF fits
     init_phot_data = Table()
@@ -1,26 +1,66 @@
 
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+import os
 import numpy as np
 import logging
 import warnings
 
+from astropy.io import fits
 from astropy.nddata import CCDData
 from astropy.wcs.wcs import FITSFixedWarning
 import astropy.units as u
 import ccdproc
 
+try:
+    # fitsio reads frames noticeably faster than astropy.io.fits; fall back
+    # to CCDData.read when it is not installed
+    import fitsio
+except ImportError:
+    fitsio = None
+
 from pipnick.utils.nickel_data import (gain, read_noise, bias_label, 
                                        dome_flat_label, sky_flat_label,
                                        sky_flat_label_alt,
                                        dark_label, focus_label)
 from pipnick.utils.nickel_masks import get_masks_from_file
 from pipnick.utils.dir_nav import organize_files, norm_str
+from pipnick.utils._clip_numba import clipped_mean
+from pipnick.utils.lacosmic_gpu import lacosmic_batch, have_cupy
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _deepcr_model():
+    """
+    Lazily construct (and memoize) the deepCR model for cosmic ray
+    rejection, on GPU when one is available.
+    """
+    try:
+        from deepCR import deepCR
+        import torch
+    except ImportError as err:
+        raise ImportError("cr_method='deepcr' requires the optional deepCR "
+                          "and pytorch packages") from err
+    device = 'GPU' if torch.cuda.is_available() else 'CPU'
+    return deepCR(mask='ACS-WFC-F606W-2-32', device=device)
+
+
+@lru_cache(maxsize=None)
+def _fov_mask():
+    """
+    Load the (invariant) Nickel FOV mask once and share it across frames.
+    """
+    mask = get_masks_from_file('fov_mask')
+    mask.setflags(write=False)
+    return mask
+
+
 def reduce_all(maindir, use_table=False, save_inters=False,
-               excl_files=[], excl_objs=[], excl_filts=[]):
+               excl_files=[], excl_objs=[], excl_filts=[],
+               cr_method='lacosmic'):
     """
     Perform reduction of raw astronomical data frames (overscan subtraction,
     bias subtraction, flat division, cosmic ray masking).
@@ -41,6 +81,12 @@ def reduce_all(maindir, use_table=False, save_inters=False,
         List of object strings to exclude (exact match not necessary).
     excl_filts : list, optional
         List of filter names to exclude.
+    cr_method : str, optional
+        Cosmic ray rejection method: 'lacosmic' (default), 'lacosmic-gpu',
+        or 'deepcr'. 'lacosmic-gpu' batches whole frame groups through the
+        CuPy implementation in pipnick.utils.lacosmic_gpu and falls back to
+        'lacosmic' when cupy or a CUDA device is unavailable; 'deepcr' needs
+        the optional deepCR/pytorch packages.
 
     Returns
     -------
@@ -60,73 +106,179 @@ def reduce_all(maindir, use_table=False, save_inters=False,
     Path.mkdir(reddir, exist_ok=True)
     Path.mkdir(procdir, exist_ok=True)
     
-    # Initialize CCDData objects and remove cosmic rays
-    logger.info("Initializing CCDData objects & removing cosmic rays")
-    warnings.simplefilter("ignore", category=FITSFixedWarning)
-    ccd_objs = [init_ccddata(file) for file in file_df.files]
-    file_df.files = ccd_objs
-    
-    # Generate master bias and master flats
-    master_bias = get_master_bias(file_df, save=save_inters, save_dir=procdir)
-    master_flats = get_master_flats(file_df, save=save_inters, save_dir=procdir)
-
-    # Filter out non-science files
-    scifiles_mask = ((file_df.objects != bias_label) &
-                     (file_df.objects != dark_label) &
-                     (file_df.objects != dome_flat_label) &
-                     (file_df.objects != sky_flat_label) &
-                     (file_df.objects != sky_flat_label_alt) &
-                     (file_df.objects != focus_label)).values
-    scifile_df = file_df.copy()[scifiles_mask]
-
-    # Perform overscan subtraction & trimming
-    logger.info(f"Performing overscan subtraction & trimming on {len(scifile_df.files)} science images")
-    scifile_df.files = [trim_overscan(scifile) for scifile in scifile_df.files]
-    if save_inters:
-        save_results(scifile_df, 'over', procdir/'overscan')
-    
-    # Perform bias subtraction
-    logger.info(f"Performing bias subtraction on {len(scifile_df.files)} science images")
-    scifile_df.files = [ccdproc.subtract_bias(scifile, master_bias) 
-                    for scifile in scifile_df.files]
-    if save_inters:
-        save_results(scifile_df, 'unbias', procdir/'unbias')
-
-    # Perform flat division for each filter
-    logger.info("Performing flat division")
-    all_red_paths = []
-    for filt in master_flats.keys():
-        logger.debug(f"{filt} Filter:")
-        scienceobjects = list(set(scifile_df.objects[scifile_df.filters == filt]))
+    # The stage pools and pending-write list are scoped to this call: a
+    # failed run must not leave futures behind for the next invocation, and
+    # no pool threads may be alive when the ingest process pool forks below
+    # (forked children inherit them and hang at interpreter exit). numpy
+    # releases the GIL inside its ufuncs, so threads scale the per-frame
+    # stages without the pickling cost of processes, and FITS writes are
+    # dispatched asynchronously so computation overlaps the I/O
+    exec_pool = ThreadPoolExecutor(max_workers=os.cpu_count())
+    write_pool = ThreadPoolExecutor(max_workers=4)
+    write_futures = []
+
+    def drain_writes():
+        # Block until all writes submitted so far are on disk, re-raising
+        # any write error
+        for future in write_futures:
+            future.result()
+        write_futures.clear()
+
+    try:
+        # Identify the science frames up front so the stages below can overlap
+        scifiles_mask = ~file_df.objects.isin(_NONSCI_LABELS).values
+
+        # On the GPU, cosmic rays are removed from whole frame groups at once
+        # after ingest rather than per frame in the workers
+        gpu_cr = cr_method == 'lacosmic-gpu'
+        if gpu_cr and not have_cupy():
+            logger.warning("cr_method='lacosmic-gpu' requires cupy and a CUDA "
+                           "device; falling back to 'lacosmic'")
+            cr_method = 'lacosmic'
+            gpu_cr = False
+
+        # Initialize CCDData objects and remove cosmic rays; frames are
+        # independent and cosmic ray removal dominates the runtime, so spread
+        # the work across a process pool
+        logger.info("Initializing CCDData objects & removing cosmic rays")
+        warnings.simplefilter("ignore", category=FITSFixedWarning)
+        with ProcessPoolExecutor(max_workers=min(len(file_df.files),
+                                                 os.cpu_count())) as executor:
+            futures = [executor.submit(init_ccddata, file,
+                                       cr_method=None if gpu_cr else cr_method)
+                       for file in file_df.files]
+
+            # Resolve the calibration frames first and build the masters while
+            # the science frames are still being cleaned in the pool
+            calib_df = file_df[~scifiles_mask].copy()
+            calib_df.files = [future.result() for future, is_sci
+                              in zip(futures, scifiles_mask) if not is_sci]
+            if gpu_cr:
+                calib_df.files = _clean_batch_gpu(calib_df.files)
+            master_bias = get_master_bias(calib_df, save=save_inters,
+                                          save_dir=procdir)
+            master_flats = get_master_flats(calib_df, save=save_inters,
+                                            save_dir=procdir)
+
+            scifile_df = file_df[scifiles_mask].copy()
+            scifile_df.files = [future.result() for future, is_sci
+                                in zip(futures, scifiles_mask) if is_sci]
+            if gpu_cr:
+                scifile_df.files = _clean_batch_gpu(scifile_df.files)
+
+        # Overscan subtraction & trimming already happened during ingest (see
+        # init_ccddata); just save the intermediates if requested
+        if save_inters:
+            save_results(scifile_df, 'over', procdir/'overscan',
+                         write_pool, write_futures)
+
+        # Perform bias subtraction in place; ccdproc.subtract_bias would copy
+        # the full frame per image. Any pending writes of these frames must land
+        # first since the data is about to be overwritten
+        drain_writes()
+        logger.info(f"Performing bias subtraction on {len(scifile_df.files)} science images")
+        def subtract_bias(sci):
+            np.subtract(sci.data, master_bias.data, out=sci.data)
+            if master_bias.mask is not None:
+                np.logical_or(sci.mask, master_bias.mask, out=sci.mask)
+            return sci
+        scifile_df.files = list(exec_pool.map(subtract_bias, scifile_df.files))
+        if save_inters:
+            save_results(scifile_df, 'unbias', procdir/'unbias',
+                         write_pool, write_futures)
+
+        # Perform flat division for each filter; drain pending writes first
+        # because the division also runs in place
+        drain_writes()
+        logger.info("Performing flat division")
+        # Normalize every master flat exactly once up front (flat_correct used
+        # to redo the mean + divide for each science frame)
+        master_flats_norm = {filt: mf.data / np.mean(mf.data)
+                             for filt, mf in master_flats.items()}
+        all_red_paths = []
+        for filt in master_flats.keys():
+            logger.debug(f"{filt} Filter:")
+            master_flat = master_flats[filt]
+            flat_norm = master_flats_norm[filt]
+            def flat_divide(sci):
+                np.divide(sci.data, flat_norm, out=sci.data)
+                if master_flat.mask is not None:
+                    np.logical_or(sci.mask, master_flat.mask, out=sci.mask)
+                return sci
+            scienceobjects = list(set(scifile_df.objects[scifile_df.filters == filt]))
         
-        for scienceobject in scienceobjects:
-            # Filter science files by object and filter
-            sub_scifile_df = scifile_df.copy()[(scifile_df.objects == scienceobject) &
-                                               (scifile_df.filters == filt)]
-            # Create directory for each science target / filter combination
-            sci_dir = reddir / (scienceobject + '_' + filt)
+            for scienceobject in scienceobjects:
+                # Filter science files by object and filter
+                sub_scifile_df = scifile_df[(scifile_df.objects == scienceobject) &
+                                            (scifile_df.filters == filt)].copy()
+                # Create directory for each science target / filter combination
+                sci_dir = reddir / (scienceobject + '_' + filt)
             
-            # Perform flat division
-            sub_scifile_df.files = [ccdproc.flat_correct(scifile, master_flats[filt]) 
-                         for scifile in sub_scifile_df.files]
+                # Perform flat division
+                sub_scifile_df.files = list(exec_pool.map(flat_divide,
+                                                      sub_scifile_df.files))
             
-            red_paths = save_results(sub_scifile_df, 'red', sci_dir)
-            all_red_paths += red_paths
+                red_paths = save_results(sub_scifile_df, 'red', sci_dir,
+                                         write_pool, write_futures)
+                all_red_paths += red_paths
     
-    # Return
-    logger.info(f"Fully reduced images saved to {reddir}")
-    logger.info("---- reduce_all() call ended")
-    return all_red_paths
+        # Wait for the asynchronous writes to land before reporting the paths
+        drain_writes()
+        logger.info(f"Fully reduced images saved to {reddir}")
+        logger.info("---- reduce_all() call ended")
+        return all_red_paths
+    finally:
+        # A failure above must not leave pending writes behind; wait them
+        # out without masking the original error, then retire this call's
+        # pools
+        for future in write_futures:
+            try:
+                future.result()
+            except Exception:
+                logger.exception("Asynchronous FITS write failed")
+        write_pool.shutdown(wait=True)
+        exec_pool.shutdown(wait=True)
+
+
+def _clean_batch_gpu(frames):
+    """
+    Remove cosmic rays from a group of ingested frames in one batched GPU
+    pass, transferring the stacked cube to the device once.
+
+    Parameters
+    ----------
+    frames : list
+        CCDData objects from init_ccddata (trimmed, gain applied).
+
+    Returns
+    -------
+    list
+        The same CCDData objects, cleaned in place with cosmic ray pixels
+        OR'd into their masks.
+    """
+    frames = list(frames)
+    cube = np.stack([frame.data for frame in frames])
+    # The data is already in electrons, so the noise model needs unit gain
+    cleaned, cr_mask = lacosmic_batch(cube, gain=1.0, readnoise=read_noise)
+    for frame, img, crs in zip(frames, cleaned, cr_mask):
+        frame.data = img
+        np.logical_or(frame.mask, crs, out=frame.mask)
+    return frames
 
 
-def init_ccddata(frame):
+def init_ccddata(frame, cr_method='lacosmic'):
     """
-    Initialize a CCDData object from a FITS file and remove cosmic rays.
+    Initialize a CCDData object from a FITS file, subtract & trim the
+    overscan, and remove cosmic rays.
 
     Parameters
     ----------
     frame : str or Path
         Path to the FITS file.
+    cr_method : str or None, optional
+        Cosmic ray rejection method: 'lacosmic' (default) or 'deepcr'.
+        None skips rejection here; reduce_all uses that to defer to the
+        batched GPU pass.
 
     Returns
     -------
@@ -134,18 +286,80 @@ def init_ccddata(frame):
         Initialized and processed CCDData object.
     """
     logger.debug(f"Removing cosmic rays from {Path(frame).name}")
-    ccd = CCDData.read(frame, unit=u.adu)
-    ccd.mask = get_masks_from_file('fov_mask')
-    ccd.mask[ccd.data > 62000] = True
-    ccd = ccdproc.cosmicray_lacosmic(ccd, gain_apply=False, gain=gain, 
-                                     readnoise=read_noise, verbose=False)
-    # Apply gain manually due to a bug in cosmicray_lacosmic function
-    ccd.data = ccd.data * gain
+    hdul = None
+    if fitsio is not None:
+        with fitsio.FITS(str(frame)) as f:
+            data = f[0].read()
+            hdr = fits.Header([(rec['name'], rec['value'], rec['comment'])
+                               for rec in f[0].read_header().records()])
+        ccd = CCDData(data, unit=u.adu, header=hdr)
+    else:
+        # Memory-map the raw frame rather than loading it eagerly; only the
+        # pages the saturation check and trim actually touch are paged in,
+        # which keeps peak RSS down when many workers ingest at once
+        hdul = fits.open(frame, memmap=True, mode='readonly')
+        ccd = CCDData(hdul[0].data, unit=u.adu, header=hdul[0].header)
+    # OR the cached FOV mask into the per-frame saturation mask in place,
+    # so the comparison output is the only allocation
+    mask = ccd.data > 62000
+    np.logical_or(mask, _fov_mask(), out=mask)
+    ccd.mask = mask
+    # Trim before cosmic ray rejection: lacosmic's cost scales with the
+    # pixel count, so there is no reason to pay for the overscan columns
+    ccd = trim_overscan(ccd)
+    if hdul is not None:
+        hdul.close()
+    # Materialize a contiguous float32 frame for the cosmic ray pass; single
+    # precision is ample for 16-bit ADU data and halves the working set
+    ccd.data = np.ascontiguousarray(ccd.data, dtype=np.float32)
+    if cr_method == 'lacosmic':
+        ccd = ccdproc.cosmicray_lacosmic(ccd, gain_apply=False, gain=gain, 
+                                         readnoise=read_noise, verbose=False)
+    elif cr_method == 'deepcr':
+        # Convolutional CR rejection; much faster than lacosmic on a GPU
+        cr_mask, cleaned = _deepcr_model().clean(ccd.data, threshold=0.5,
+                                                 inpaint=True)
+        ccd.data = cleaned
+        np.logical_or(ccd.mask, cr_mask.astype(bool), out=ccd.mask)
+    elif cr_method is not None:
+        raise ValueError("cr_method must be 'lacosmic', 'deepcr', or None")
+    # cosmicray_lacosmic promotes to float64; drop back to float32 so every
+    # downstream full-frame op moves half the bytes
+    ccd.data = ccd.data.astype(np.float32, copy=False)
+    # Apply gain manually (and in place) due to a bug in cosmicray_lacosmic
+    np.multiply(ccd.data, gain, out=ccd.data)
     # Bug in cosmicray_lacosmic returns CCDData.data as a Quanity with incorrect
     # units electron/ADU if gain_apply=True. Therefore, we manually apply gain,
     # and leave ccd.data as a numpy array
     return ccd
 
+@lru_cache(maxsize=4)
+def _nickel_slices(naxis1, naxis2, cover, datasec):
+    """
+    Parse the data and overscan sections into numpy slices. The geometry is
+    fixed per instrument setup, so this is computed once rather than
+    round-tripping FITS section strings through ccdproc for every frame.
+
+    Parameters
+    ----------
+    naxis1, naxis2 : int
+        Raw frame dimensions from the header.
+    cover : int
+        Number of overscan columns (COVER).
+    datasec : str
+        1-based FITS data section string, '[x1:x2,y1:y2]'.
+
+    Returns
+    -------
+    tuple
+        (data_slices, overscan_slices) for indexing the raw ndarray.
+    """
+    x1, x2, y1, y2 = [int(v) for pair in datasec.strip('[]').split(',')
+                      for v in pair.split(':')]
+    data_slices = (slice(y1 - 1, y2), slice(x1 - 1, x2))
+    overscan_slices = (slice(0, naxis2), slice(naxis1 - cover, naxis1))
+    return data_slices, overscan_slices
+
 def trim_overscan(ccd):
     """
     Subtract overscan and trim the overscan region from the image.
@@ -160,23 +374,24 @@ def trim_overscan(ccd):
     CCDData
         Processed CCDData object with overscan subtracted and image trimmed.
     """
-    def nickel_oscansec(hdr):
-        nc = hdr['NAXIS1']
-        no = hdr['COVER']
-        nr = hdr['NAXIS2']
-        return f'[{nc-no+1}:{nc},1:{nr}]'
-    
-    oscansec = nickel_oscansec(ccd.header)
-    proc_ccd = ccdproc.subtract_overscan(ccd, fits_section=oscansec, overscan_axis=1)
-    return ccdproc.trim_image(proc_ccd, fits_section=ccd.header['DATASEC'])
-
-def stack_frames(raw_frames, frame_type):
+    hdr = ccd.header
+    data_slices, overscan_slices = _nickel_slices(hdr['NAXIS1'], hdr['NAXIS2'],
+                                                  hdr['COVER'], hdr['DATASEC'])
+    # Per-row overscan mean, matching subtract_overscan's default model
+    oscan = np.mean(ccd.data[overscan_slices], axis=1)
+    trimmed = ccd.data[data_slices] - oscan[:, None]
+    return CCDData(trimmed, unit=ccd.unit,
+                   mask=None if ccd.mask is None else ccd.mask[data_slices],
+                   header=ccd.header.copy())
+
+def stack_frames(frames, frame_type):
     """
-    Stack frames by trimming overscan and combining them with sigma clipping.
+    Stack frames (already overscan-trimmed during ingest) by combining them
+    with sigma clipping.
 
     Parameters
     ----------
-    raw_frames : list
+    frames : list
         List of CCDData objects to combine.
     frame_type : str
         Type of frames (e.g., 'flat').
@@ -186,21 +401,43 @@ def stack_frames(raw_frames, frame_type):
     CCDData
         Combined CCDData object.
     """
-    trimmed_frames = [trim_overscan(frame) for frame in raw_frames]
-    combiner = ccdproc.Combiner(trimmed_frames)
-    
-    old_n_masked = 0
-    new_n_masked = 1
-    while new_n_masked > old_n_masked:
-        combiner.sigma_clipping(low_thresh=3, high_thresh=3, func=np.ma.mean)
-        old_n_masked = new_n_masked
-        new_n_masked = combiner.data_arr.mask.sum()
+    frames = list(frames)
+
+    # Build a plain ndarray stack with NaNs at the masked pixels; NaN-aware
+    # reductions are much faster than iterating masked-array statistics
+    # through ccdproc.Combiner. The stack is preallocated with the combine
+    # axis last (fastest-varying), so the per-pixel clip and mean walk
+    # contiguous memory instead of striding a full frame between samples
+    ny, nx = frames[0].data.shape
+    stack = np.empty((ny, nx, len(frames)), dtype=np.float32)
+    for i, frame in enumerate(frames):
+        stack[..., i] = frame.data
+        stack[frame.mask, i] = np.nan
 
     if frame_type == 'flat':
-        scaling_func = lambda arr: 1/np.ma.average(arr)
-        combiner.scaling = scaling_func
-    stack = combiner.average_combine()  
-    return stack
+        # Normalize each flat to unit mean before combining: one reciprocal
+        # per frame, then a single in-place multiply over the stack (a
+        # per-pixel divide is several times slower than a multiply)
+        scales = 1.0 / np.nanmean(stack, axis=(0, 1), keepdims=True)
+        stack *= scales
+
+    # Iterate the per-pixel 3-sigma clip to convergence and average the
+    # survivors in one jitted, row-parallel pass; astropy's sigma_clip
+    # re-walks the whole stack on every iteration
+    combined = clipped_mean(stack)
+
+    # Pixels masked or clipped in every frame carry the mask; fill their data
+    # with the image median so downstream statistics (e.g. flat_correct's
+    # flat normalization) are not poisoned by NaNs
+    combined_mask = np.isnan(combined)
+    if combined_mask.any():
+        combined[combined_mask] = np.nanmedian(combined)
+
+    # Masters stay float32 so the bias subtraction and flat division over
+    # the science frames do as well
+    return CCDData(combined.astype(np.float32, copy=False),
+                   unit=frames[0].unit, mask=combined_mask,
+                   header=frames[0].header.copy())
 
 def get_master_bias(file_df, save=True, save_dir=None):
     """
@@ -221,7 +458,7 @@ def get_master_bias(file_df, save=True, save_dir=None):
         Master bias CCDData object.
     """
     logger.info("Combining bias files into master bias")
-    bias_df = file_df.copy()[file_df.objects == bias_label]
+    bias_df = file_df[file_df.objects == bias_label]
     logger.info(f"Using {len(bias_df.files)} bias frames: {[file.stem.split('_')[0] for file in bias_df.paths]}")
 
     master_bias = stack_frames(bias_df.files, frame_type='bias')
@@ -267,7 +504,7 @@ def get_master_flats(file_df, save=True, save_dir=None):
     
     # Make a master flat for all filts in which flats have been taken
     for filt in set(file_df.filters[file_df.objects == flattype]):
-        flat_df = file_df.copy()[(file_df.objects == flattype) & (file_df.filters == filt)]
+        flat_df = file_df[(file_df.objects == flattype) & (file_df.filters == filt)]
         logger.info(f"Using {len(flat_df.files)} flat frames: {[path.stem.split('_')[0] for path in flat_df.paths]}")
 
         master_flat = stack_frames(flat_df.files, frame_type='flat')
@@ -280,7 +517,8 @@ def get_master_flats(file_df, save=True, save_dir=None):
     
     return master_flats
 
-def save_results(scifile_df, modifier_str, save_dir):
+def save_results(scifile_df, modifier_str, save_dir, write_pool,
+                 write_futures):
     """
     Save (partially) processed science files to the specified directory.
 
@@ -292,6 +530,11 @@ def save_results(scifile_df, modifier_str, save_dir):
         String to append to filenames to indicate processing stage.
     save_dir : Path
         Directory to save the processed files.
+    write_pool : ThreadPoolExecutor
+        Pool the asynchronous writes are submitted to.
+    write_futures : list
+        List the pending write futures are appended to; the caller drains
+        it before mutating the frames in place or returning.
 
     Returns
     -------
@@ -301,8 +544,11 @@ def save_results(scifile_df, modifier_str, save_dir):
     Path.mkdir(save_dir, exist_ok=True)
     logger.info(f"Saving {len(scifile_df.files)} _{modifier_str} images {save_dir.name} images to {save_dir}")
     save_paths = [save_dir / (path.stem.split('_')[0] + f"_{modifier_str}" + path.suffix) for path in scifile_df.paths]
+    # Writes are submitted asynchronously so the next stage's computation
+    # overlaps the I/O; reduce_all drains them before mutating or returning
     for file, path in zip(scifile_df.files, save_paths):
-        file.write(path, overwrite=True)
+        write_futures.append(write_pool.submit(file.write, path,
+                                               overwrite=True))
     return save_paths
 
 
@@ -313,3 +559,7 @@ sky_flat_label_alt = norm_str(sky_flat_label_alt)
 dark_label = norm_str(dark_label)
 focus_label = norm_str(focus_label)
 
+# Everything that is not a science frame
+_NONSCI_LABELS = frozenset({bias_label, dark_label, dome_flat_label,
+                            sky_flat_label, sky_flat_label_alt, focus_label})
+
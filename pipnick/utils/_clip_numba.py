@@ -0,0 +1,75 @@
+import numpy as np
+from numba import config, njit, prange
+
+# The default tbb threading layer hangs the interpreter at exit once a
+# process pool has forked after a parallel region, which reduce_all does on
+# every call after its first; workqueue is fork-safe and always available
+config.THREADING_LAYER = 'workqueue'
+
+
+# fastmath is limited to flags that preserve NaN semantics: with the full
+# set (nnan), np.isnan is folded to False and masked samples poison the sums
+@njit(cache=True, parallel=True, fastmath={'contract', 'reassoc', 'arcp'})
+def clipped_mean(stack, sigma=3.0):
+    """
+    Per-pixel iterative sigma-clipped mean along the last axis of a
+    (ny, nx, nframes) stack.
+
+    Each pixel's samples are clipped against the mean +/- sigma * std of
+    the surviving samples until a pass rejects nothing (a scalar counter
+    tracks rejections, so convergence never requires a mask reduction).
+    NaN entries are treated as already rejected; pixels with no surviving
+    samples come back NaN. Rows are processed in parallel, and the frame
+    axis is last so each pixel's samples are contiguous.
+
+    Parameters
+    ----------
+    stack : numpy.ndarray
+        Frame stack, shape (ny, nx, nframes).
+    sigma : float, optional
+        Clipping threshold in standard deviations.
+
+    Returns
+    -------
+    numpy.ndarray
+        Clipped mean image, shape (ny, nx), float32.
+    """
+    ny, nx, nf = stack.shape
+    out = np.empty((ny, nx), dtype=np.float32)
+    for i in prange(ny):
+        keep = np.empty(nf, dtype=np.bool_)
+        for j in range(nx):
+            # Running sums are updated incrementally as samples are
+            # rejected, so each clipping pass is a single sweep
+            n = 0
+            lin = 0.
+            sqr = 0.
+            for k in range(nf):
+                v = stack[i, j, k]
+                good = not np.isnan(v)
+                keep[k] = good
+                if good:
+                    n += 1
+                    lin += v
+                    sqr += v * v
+            mean = np.nan
+            while n > 0:
+                mean = lin / n
+                var = sqr / n - mean * mean
+                if var < 0.:
+                    var = 0.
+                hw = sigma * np.sqrt(var)
+                removed = 0
+                for k in range(nf):
+                    if keep[k]:
+                        v = stack[i, j, k]
+                        if v < mean - hw or v > mean + hw:
+                            keep[k] = False
+                            removed += 1
+                            lin -= v
+                            sqr -= v * v
+                if removed == 0:
+                    break
+                n -= removed
+            out[i, j] = mean
+    return out